@@ -1,16 +1,15 @@
 import os
 from typing import Optional
 import logging
-from pymongo import MongoClient
-from pymongo.database import Database
-from pymongo.collection import Collection
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection, AsyncIOMotorDatabase
 
 logger = logging.getLogger(__name__)
 
 class DatabaseClient:
-    client: Optional[MongoClient] = None
-    db: Optional[Database] = None
-    collection: Optional[Collection] = None
+    client: Optional[AsyncIOMotorClient] = None
+    db: Optional[AsyncIOMotorDatabase] = None
+    collection: Optional[AsyncIOMotorCollection] = None
+    rollup_collection: Optional[AsyncIOMotorCollection] = None
 
 database = DatabaseClient()
 
@@ -24,15 +23,18 @@ async def connect_to_mongo():
         
         logger.info(f"Connecting to MongoDB: {database_name}.{collection_name}")
         
-        database.client = MongoClient(mongo_uri)
+        database.client = AsyncIOMotorClient(mongo_uri)
         
-        database.client.admin.command('ping')
+        await database.client.admin.command('ping')
         logger.info("Successfully connected to MongoDB")
         
         database.db = database.client[database_name]
         database.collection = database.db[collection_name]
+        database.rollup_collection = database.db[
+            os.getenv("MONGODB_ROLLUP_COLLECTION", "sales_rollup")
+        ]
         
-        count = database.collection.count_documents({})
+        count = await database.collection.count_documents({})
         logger.info(f"MongoDB connection established. Collection '{collection_name}' has {count:,} documents")
         
     except Exception as e:
@@ -48,11 +50,18 @@ async def close_mongo_connection():
             database.client = None
             database.db = None
             database.collection = None
+            database.rollup_collection = None
     except Exception as e:
         logger.error(f"Error closing MongoDB connection: {str(e)}", exc_info=True)
 
-def get_collection() -> Collection:
+def get_collection() -> AsyncIOMotorCollection:
     """Get the MongoDB collection"""
     if database.collection is None:
         raise ValueError("MongoDB not connected. Make sure connect_to_mongo() was called.")
     return database.collection
+
+def get_rollup_collection() -> AsyncIOMotorCollection:
+    """Get the precomputed summary rollup collection"""
+    if database.rollup_collection is None:
+        raise ValueError("MongoDB not connected. Make sure connect_to_mongo() was called.")
+    return database.rollup_collection
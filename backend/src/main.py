@@ -1,5 +1,7 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from src.config.database import connect_to_mongo, close_mongo_connection
 from src.routes import sales
 import os
@@ -14,7 +16,23 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Sales Management API", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    try:
+        await connect_to_mongo()
+        logger.info("Application startup complete - MongoDB connected")
+    except Exception as e:
+        logger.error(f"Failed to start application: {str(e)}", exc_info=True)
+        raise
+    yield
+    await close_mongo_connection()
+
+app = FastAPI(
+    title="Sales Management API",
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
+)
 
 origins_str = os.getenv("CORS_ORIGINS", "http://localhost:3000")
 origins = [origin.strip() for origin in origins_str.split(",") if origin.strip()]
@@ -28,19 +46,6 @@ app.add_middleware(
 
 app.include_router(sales.router)
 
-@app.on_event("startup")
-async def startup_event():
-    try:
-        await connect_to_mongo()
-        logger.info("Application startup complete - MongoDB connected")
-    except Exception as e:
-        logger.error(f"Failed to start application: {str(e)}", exc_info=True)
-        raise
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    await close_mongo_connection()
-
 @app.get("/")
 async def root():
     return {"message": "Sales Management API"}
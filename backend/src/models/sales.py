@@ -68,6 +68,7 @@ class SalesResponse(BaseModel):
     page: int
     page_size: int
     total_pages: int
+    next_cursor: Optional[dict] = None
 
 class SummaryStats(BaseModel):
     total_units_sold: int
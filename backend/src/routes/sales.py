@@ -1,4 +1,6 @@
-from fastapi import APIRouter, Query, HTTPException
+from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi.responses import ORJSONResponse
+from functools import lru_cache
 from typing import Optional, List
 from src.services.sales_service import SalesService
 from src.models.sales import SalesResponse, SummaryStats
@@ -8,6 +10,11 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/sales", tags=["sales"])
 
+@lru_cache
+def get_service() -> SalesService:
+    """Share one SalesService across requests so its state survives the request"""
+    return SalesService()
+
 @router.get("/transactions", response_model=SalesResponse)
 async def get_transactions(
     search: Optional[str] = Query(None, description="Search across multiple fields: name, phone, transaction ID, customer ID, product ID, employee name, etc."),
@@ -23,7 +30,10 @@ async def get_transactions(
     sort_by: str = Query("date", description="Sort field: date, quantity, or customer_name"),
     sort_order: str = Query("desc", description="Sort order: asc or desc"),
     page: int = Query(1, ge=1, description="Page number"),
-    page_size: int = Query(10, ge=1, le=100, description="Items per page")
+    page_size: int = Query(10, ge=1, le=100, description="Items per page"),
+    after_date: Optional[str] = Query(None, description="Keyset cursor: date of the last row on the previous page (date sort only)"),
+    after_id: Optional[int] = Query(None, description="Keyset cursor: transaction_id of the last row on the previous page"),
+    service: SalesService = Depends(get_service)
 ):
     """Get sales transactions with search, filter, sort, and pagination"""
     try:
@@ -40,9 +50,8 @@ async def get_transactions(
         tags = tags if tags and len(tags) > 0 else None
         payment_methods = payment_methods if payment_methods and len(payment_methods) > 0 else None
         
-        logger.info(f"Received filters - genders: {genders}, customer_regions: {customer_regions}, product_categories: {product_categories}")
-        logger.info(f"Received sort params - sort_by: {sort_by}, sort_order: {sort_order}")
-        service = SalesService()
+        logger.debug(f"Received filters - genders: {genders}, customer_regions: {customer_regions}, product_categories: {product_categories}")
+        logger.debug(f"Received sort params - sort_by: {sort_by}, sort_order: {sort_order}")
         result = await service.get_transactions(
             search=search,
             customer_regions=customer_regions,
@@ -57,14 +66,74 @@ async def get_transactions(
             sort_by=sort_by,
             sort_order=sort_order,
             page=page,
-            page_size=page_size
+            page_size=page_size,
+            after_date=after_date,
+            after_id=after_id
         )
-        logger.info(f"Returning {len(result['transactions'])} transactions out of {result['total']} total")
-        return result
+        logger.debug(f"Returning {len(result['transactions'])} transactions out of {result['total']} total")
+        # Rows were already validated when the SalesTransaction models were
+        # built; returning a Response directly skips FastAPI's second
+        # response-model validation pass and serializes with orjson.
+        return ORJSONResponse({
+            "transactions": [t.model_dump() for t in result["transactions"]],
+            "total": result["total"],
+            "page": result["page"],
+            "page_size": result["page_size"],
+            "total_pages": result["total_pages"],
+            "next_cursor": result["next_cursor"]
+        })
     except Exception as e:
         logger.error(f"Error fetching transactions: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
+@router.get("/transactions-with-summary")
+async def get_transactions_with_summary(
+    search: Optional[str] = Query(None, description="Search across multiple fields: name, phone, transaction ID, customer ID, product ID, employee name, etc."),
+    customer_regions: Optional[List[str]] = Query(None, description="Filter by customer regions"),
+    genders: Optional[List[str]] = Query(None, description="Filter by genders"),
+    age_min: Optional[int] = Query(None, description="Minimum age"),
+    age_max: Optional[int] = Query(None, description="Maximum age"),
+    product_categories: Optional[List[str]] = Query(None, description="Filter by product categories"),
+    tags: Optional[List[str]] = Query(None, description="Filter by tags"),
+    payment_methods: Optional[List[str]] = Query(None, description="Filter by payment methods"),
+    date_from: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
+    date_to: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
+    sort_by: str = Query("date", description="Sort field: date, quantity, or customer_name"),
+    sort_order: str = Query("desc", description="Sort order: asc or desc"),
+    page: int = Query(1, ge=1, description="Page number"),
+    page_size: int = Query(10, ge=1, le=100, description="Items per page"),
+    service: SalesService = Depends(get_service)
+):
+    """Get a transactions page and its summary stats in a single round trip"""
+    try:
+        result = await service.get_transactions_with_summary(
+            search=search,
+            customer_regions=customer_regions,
+            genders=genders,
+            age_min=age_min,
+            age_max=age_max,
+            product_categories=product_categories,
+            tags=tags,
+            payment_methods=payment_methods,
+            date_from=date_from,
+            date_to=date_to,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            page=page,
+            page_size=page_size
+        )
+        return ORJSONResponse({
+            "transactions": [t.model_dump() for t in result["transactions"]],
+            "total": result["total"],
+            "page": result["page"],
+            "page_size": result["page_size"],
+            "total_pages": result["total_pages"],
+            "summary": result["summary"].model_dump()
+        })
+    except Exception as e:
+        logger.error(f"Error fetching transactions with summary: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
 @router.get("/summary", response_model=SummaryStats)
 async def get_summary(
     customer_regions: Optional[List[str]] = Query(None),
@@ -75,7 +144,8 @@ async def get_summary(
     tags: Optional[List[str]] = Query(None),
     payment_methods: Optional[List[str]] = Query(None),
     date_from: Optional[str] = Query(None),
-    date_to: Optional[str] = Query(None)
+    date_to: Optional[str] = Query(None),
+    service: SalesService = Depends(get_service)
 ):
     """Get summary statistics based on current filters"""
     try:
@@ -85,7 +155,6 @@ async def get_summary(
         tags = tags if tags and len(tags) > 0 else None
         payment_methods = payment_methods if payment_methods and len(payment_methods) > 0 else None
         
-        service = SalesService()
         return await service.get_summary_stats(
             customer_regions=customer_regions,
             genders=genders,
@@ -102,10 +171,9 @@ async def get_summary(
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @router.get("/filter-options")
-async def get_filter_options():
+async def get_filter_options(service: SalesService = Depends(get_service)):
     """Get all available filter options"""
     try:
-        service = SalesService()
         return await service.get_filter_options()
     except Exception as e:
         logger.error(f"Error fetching filter options: {str(e)}", exc_info=True)
@@ -1,29 +1,126 @@
 from typing import Optional, List
+import asyncio
+import time
+from collections import OrderedDict
+from datetime import datetime
+from functools import lru_cache
 import re
-import math
-from pymongo.collection import Collection
-from pymongo import ASCENDING, DESCENDING
-from src.config.database import get_collection
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import ASCENDING, DESCENDING, ReadPreference
+from pymongo.read_concern import ReadConcern
+from src.config.database import get_collection, get_rollup_collection
 from src.models.sales import SalesTransaction, SummaryStats
 import logging
 
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=256)
+def _parse_iso_date(value: str) -> datetime:
+    """Parse a YYYY-MM-DD string; cached since dashboard polling repeats the same bounds"""
+    return datetime.strptime(value, '%Y-%m-%d')
+
+@lru_cache(maxsize=4096)
+def _escape_regex(s: str) -> str:
+    """re.escape is pure Python per call; repeated search needles hit the cache"""
+    return re.escape(s)
+
+@lru_cache(maxsize=1024)
+def _to_title_case(s) -> str:
+    """Capitalize a value for display: str.capitalize is a single C-level call
+
+    Gender, region, category, payment method and tags take a handful of
+    distinct values across millions of rows, so the cache turns per-row
+    strip/capitalize work into a dict hit.
+    """
+    if not s:
+        return s
+    return str(s).strip().capitalize()
+
 class SalesService:
+    # Result pages cached per unique query-parameter tuple; entries expire
+    # after CACHE_TTL_SECONDS so a rerun of the migration against the live
+    # database shows up without restarting the API
+    TRANSACTIONS_CACHE_SIZE = 1024
+    SUMMARY_CACHE_SIZE = 512
+    # Filter options and summary stats are recomputed at most once per TTL
+    # window, so repeat dashboard polls within it skip the server-side scans
+    CACHE_TTL_SECONDS = 60
+
+    # Exactly the fields SalesTransaction carries; migration-only fields like
+    # _id and tags_arr never leave the server
+    TRANSACTION_PROJECTION = {
+        '_id': 0,
+        'transaction_id': 1,
+        'date': 1,
+        'customer_id': 1,
+        'customer_name': 1,
+        'phone_number': 1,
+        'gender': 1,
+        'age': 1,
+        'customer_region': 1,
+        'customer_type': 1,
+        'product_id': 1,
+        'product_name': 1,
+        'brand': 1,
+        'product_category': 1,
+        'tags': 1,
+        'quantity': 1,
+        'price_per_unit': 1,
+        'discount_percentage': 1,
+        'total_amount': 1,
+        'final_amount': 1,
+        'payment_method': 1,
+        'order_status': 1,
+        'delivery_type': 1,
+        'store_id': 1,
+        'store_location': 1,
+        'salesperson_id': 1,
+        'employee_name': 1
+    }
+
+    # Shared $group spec for the summary aggregation and the fused
+    # page-plus-summary facet
+    SUMMARY_GROUP = {
+        '_id': None,
+        'total_units_sold': {'$sum': '$quantity'},
+        'total_amount': {'$sum': '$total_amount'},
+        'total_final_amount': {'$sum': '$final_amount'},
+        'total_sales_records': {'$sum': 1}
+    }
+
     def __init__(self):
-        self.collection: Collection = get_collection()
+        self.collection: AsyncIOMotorCollection = get_collection()
+        # Every query in this service is read-only reporting; preferring
+        # secondaries with 'available' read concern spreads the scan load
+        # across a replica set (and is a no-op on a standalone server)
+        self.read_collection = self.collection.with_options(
+            read_preference=ReadPreference.SECONDARY_PREFERRED,
+            read_concern=ReadConcern('available')
+        )
+        self.rollup_collection = get_rollup_collection().with_options(
+            read_preference=ReadPreference.SECONDARY_PREFERRED,
+            read_concern=ReadConcern('available')
+        )
+        self._filter_options_cache: Optional[tuple] = None
+        self._filter_options_lock = asyncio.Lock()
+        self._transactions_cache: OrderedDict = OrderedDict()
+        self._summary_cache: OrderedDict = OrderedDict()
 
     def _normalize_string_list(self, value_list: Optional[List[str]], to_lowercase: bool = True) -> Optional[List[str]]:
         """Normalize string list by stripping whitespace, converting to lowercase, and filtering empty values"""
-        if value_list is None:
-            return None
-        if not isinstance(value_list, list):
-            return None
-        if len(value_list) == 0:
+        if not value_list or not isinstance(value_list, list):
             return None
-        normalized = [str(v).strip().lower() if to_lowercase else str(v).strip() 
-                     for v in value_list if v is not None and str(v).strip()]
-        return normalized if normalized else None
+        # Single pass: str()/strip() once per element instead of once in the
+        # filter and again in the value expression
+        normalized = []
+        for v in value_list:
+            if v is None:
+                continue
+            s = str(v).strip()
+            if not s:
+                continue
+            normalized.append(s.lower() if to_lowercase else s)
+        return normalized or None
 
     def _validate_filters(
         self,
@@ -47,9 +144,8 @@ class SalesService:
         
         if date_from and date_to:
             try:
-                from datetime import datetime
-                date_from_obj = datetime.strptime(date_from.strip(), '%Y-%m-%d')
-                date_to_obj = datetime.strptime(date_to.strip(), '%Y-%m-%d')
+                date_from_obj = _parse_iso_date(date_from.strip())
+                date_to_obj = _parse_iso_date(date_to.strip())
                 if date_from_obj > date_to_obj:
                     raise ValueError(f"Conflicting date range: date_from ({date_from}) cannot be after date_to ({date_to})")
             except ValueError as e:
@@ -77,34 +173,32 @@ class SalesService:
         
         if search and search.strip():
             search_term = search.strip()
-            search_lower = search_term.lower()
             search_digits = ''.join(filter(str.isdigit, search_term))
-            
-            search_conditions = []
-            
-            text_fields = [
-                'customer_name', 'product_name', 'employee_name', 'store_location',
-                'brand', 'customer_type', 'order_status', 'delivery_type'
-            ]
-            for field in text_fields:
-                search_conditions.append({field: {'$regex': re.escape(search_lower), '$options': 'i'}})
-            
-            id_fields = ['customer_id', 'product_id', 'store_id', 'salesperson_id']
-            for field in id_fields:
-                search_conditions.append({field: {'$regex': re.escape(search_lower), '$options': 'i'}})
-            
-            if search_digits:
-                try:
-                    transaction_id = int(search_digits)
-                    search_conditions.append({'transaction_id': transaction_id})
-                except ValueError:
-                    pass
-            
-            if search_digits:
-                search_conditions.append({'phone_number': {'$regex': re.escape(search_digits), '$options': 'i'}})
-            
-            if search_conditions:
+
+            if search_digits and search_digits == search_term:
+                # Pure-numeric needles are id or phone lookups; $text cannot
+                # be nested under $or, so they take the exact-match branch
+                search_conditions = []
+                # transaction_id never exceeds 18 digits; longer inputs skip
+                # the wasted branch (and the big-int construction)
+                if len(search_digits) <= 18:
+                    search_conditions.append({'transaction_id': int(search_digits)})
+                if 7 <= len(search_digits) <= 15:
+                    # A full-length number matches a stored phone exactly, so
+                    # equality can use the btree instead of a regex scan
+                    search_conditions.append({'phone_number': search_digits})
+                elif len(search_digits) < 7:
+                    search_conditions.append({'phone_number': {'$regex': _escape_regex(search_digits), '$options': 'i'}})
+                if not search_conditions:
+                    # Longer than any id or phone can be: match nothing
+                    # rather than dropping the search predicate entirely
+                    search_conditions.append({'transaction_id': {'$in': []}})
                 query['$or'] = search_conditions
+            else:
+                # The compound text index created by the migration covers all
+                # twelve string fields the search box used to regex-scan, so
+                # the lookup becomes a tokenized inverted-index probe
+                query['$text'] = {'$search': search_term}
         
         customer_regions = self._normalize_string_list(customer_regions, to_lowercase=True)
         if customer_regions:
@@ -128,26 +222,27 @@ class SalesService:
         
         tags = self._normalize_string_list(tags, to_lowercase=True)
         if tags:
-            tag_conditions = [{'tags': {'$regex': f'\\b{re.escape(tag)}\\b', '$options': 'i'}} for tag in tags]
-            if '$or' in query:
-                search_or = query.pop('$or')
-                query['$and'] = query.get('$and', []) + [
-                    {'$or': search_or},
-                    {'$or': tag_conditions}
-                ]
-            else:
-                query['$or'] = tag_conditions
+            # tags_arr is the lowercased array the migration splits out of the
+            # raw tags string; its multikey index serves this directly, and a
+            # plain field predicate no longer collides with the search $or.
+            # $in keeps the original any-of semantics the regex $or had.
+            query['tags_arr'] = {'$in': tags}
         
         payment_methods = self._normalize_string_list(payment_methods, to_lowercase=True)
         if payment_methods:
             query['payment_method'] = {'$in': payment_methods}
         
         if date_from and date_from.strip() or date_to and date_to.strip():
+            # Dates are stored as BSON dates, so range bounds are compared as
+            # native timestamps instead of strings
             date_query = {}
-            if date_from and date_from.strip():
-                date_query['$gte'] = date_from.strip()
-            if date_to and date_to.strip():
-                date_query['$lte'] = date_to.strip()
+            try:
+                if date_from and date_from.strip():
+                    date_query['$gte'] = _parse_iso_date(date_from.strip())
+                if date_to and date_to.strip():
+                    date_query['$lte'] = _parse_iso_date(date_to.strip())
+            except ValueError:
+                raise ValueError(f"Invalid date format. Expected YYYY-MM-DD format.")
             query['date'] = date_query
         
         return query
@@ -165,26 +260,24 @@ class SalesService:
 
     def _convert_to_transaction(self, doc: dict) -> SalesTransaction:
         """Convert MongoDB document to SalesTransaction model"""
-        doc.pop('_id', None)
-        
-        def to_title_case(s):
-            if not s:
-                return s
-            s_str = str(s).strip()
-            if not s_str:
-                return s_str
-            return s_str[0].upper() + s_str[1:].lower() if len(s_str) > 1 else s_str.upper()
-        
+        # Only the page_size rows that reach the client pay for formatting
+        # the BSON date back into the API's YYYY-MM-DD string
+        date_value = doc.get('date')
+        if isinstance(date_value, datetime):
+            doc['date'] = date_value.strftime('%Y-%m-%d')
+        elif date_value is None:
+            doc['date'] = ''
+
         if 'gender' in doc:
-            doc['gender'] = to_title_case(doc['gender'])
+            doc['gender'] = _to_title_case(doc['gender'])
         if 'customer_region' in doc:
-            doc['customer_region'] = to_title_case(doc['customer_region'])
+            doc['customer_region'] = _to_title_case(doc['customer_region'])
         if 'product_category' in doc:
-            doc['product_category'] = to_title_case(doc['product_category'])
+            doc['product_category'] = _to_title_case(doc['product_category'])
         if 'payment_method' in doc:
-            doc['payment_method'] = to_title_case(doc['payment_method'])
+            doc['payment_method'] = _to_title_case(doc['payment_method'])
         if 'tags' in doc and doc['tags']:
-            tags_list = [to_title_case(t.strip()) for t in str(doc['tags']).split(',') if t.strip()]
+            tags_list = [_to_title_case(t) for t in str(doc['tags']).split(',') if t.strip()]
             doc['tags'] = ','.join(tags_list)
         
         return SalesTransaction(**doc)
@@ -204,10 +297,40 @@ class SalesService:
         sort_by: str = "date",
         sort_order: str = "desc",
         page: int = 1,
-        page_size: int = 10
+        page_size: int = 10,
+        after_date: Optional[str] = None,
+        after_id: Optional[int] = None
     ) -> dict:
-        """Get transactions with search, filter, sort, and pagination"""
-        
+        """Get transactions with search, filter, sort, and pagination
+
+        When after_date (and after_id) from a previous page's next_cursor are
+        supplied and the sort is by date, pagination seeks directly into the
+        (date, _id) index instead of walking and discarding skip documents.
+        """
+
+        cache_key = (
+            search,
+            tuple(customer_regions) if customer_regions else None,
+            tuple(genders) if genders else None,
+            age_min,
+            age_max,
+            tuple(product_categories) if product_categories else None,
+            tuple(tags) if tags else None,
+            tuple(payment_methods) if payment_methods else None,
+            date_from,
+            date_to,
+            sort_by,
+            sort_order,
+            page,
+            page_size,
+            after_date,
+            after_id
+        )
+        cached = self._transactions_cache.get(cache_key)
+        if cached is not None and cached[0] > time.monotonic():
+            self._transactions_cache.move_to_end(cache_key)
+            return cached[1]
+
         query = self._build_query(
             search=search,
             customer_regions=customer_regions,
@@ -223,14 +346,67 @@ class SalesService:
         
         sort_spec = self._build_sort(sort_by=sort_by, sort_order=sort_order)
         
-        total = self.collection.count_documents(query)
-        total_pages = math.ceil(total / page_size) if total > 0 else 0
-        
-        skip = (page - 1) * page_size
-        
-        cursor = self.collection.find(query).sort(sort_spec).skip(skip).limit(page_size)
-        documents = list(cursor)
-        
+        # Keyset pagination: seek past the previous page's last (date, _id)
+        # instead of discarding skip documents. Only the date sort has a
+        # stable key to seek on; other sorts keep the skip fallback.
+        keyset = None
+        sort_doc = dict(sort_spec)
+        if after_date and after_date.strip() and sort_spec[0][0] == 'date':
+            op = '$lt' if sort_spec[0][1] == DESCENDING else '$gt'
+            after_dt = _parse_iso_date(after_date.strip())
+            if after_id is not None:
+                keyset = {'$or': [
+                    {'date': {op: after_dt}},
+                    {'date': after_dt, '_id': {op: after_id}}
+                ]}
+            else:
+                keyset = {'date': {op: after_dt}}
+            # _id (= transaction_id) breaks ties so the cursor never skips
+            # or repeats rows that share a date
+            sort_doc['_id'] = sort_spec[0][1]
+
+        if keyset is not None:
+            # The seek predicate stays inside the data sub-pipeline so the
+            # count facet still reports the full filtered total rather than
+            # only the rows after the cursor
+            data_stages = [
+                {'$match': keyset},
+                {'$sort': sort_doc},
+                {'$limit': page_size},
+                {'$project': self.TRANSACTION_PROJECTION}
+            ]
+        else:
+            data_stages = [
+                {'$sort': sort_doc},
+                {'$skip': (page - 1) * page_size},
+                {'$limit': page_size},
+                {'$project': self.TRANSACTION_PROJECTION}
+            ]
+
+        if query:
+            # One aggregation returns the page and the matching count
+            # together, so the server executes the query plan once instead
+            # of twice
+            pipeline = [
+                {'$match': query},
+                {
+                    '$facet': {
+                        'data': data_stages,
+                        'meta': [{'$count': 'total'}]
+                    }
+                }
+            ]
+            facets = (await self.read_collection.aggregate(pipeline).to_list(length=1))[0]
+            documents = facets['data']
+            total = facets['meta'][0]['total'] if facets['meta'] else 0
+        else:
+            # Unfiltered listing: collection metadata answers the count in
+            # O(1), so skip the facet's counting scan entirely
+            documents = await self.read_collection.aggregate(data_stages).to_list(length=page_size)
+            total = await self.read_collection.estimated_document_count()
+        # Integer ceiling division; also correct for total == 0
+        total_pages = (total + page_size - 1) // page_size
+
         transactions = []
         for doc in documents:
             try:
@@ -239,14 +415,29 @@ class SalesService:
             except Exception as e:
                 logger.warning(f"Error converting document: {str(e)}")
                 continue
+
+        next_cursor = None
+        if sort_spec[0][0] == 'date' and len(documents) == page_size:
+            last = documents[-1]
+            next_cursor = {
+                'after_date': last['date'],
+                'after_id': last['transaction_id']
+            }
         
-        return {
+        result = {
             "transactions": transactions,
             "total": total,
             "page": page,
             "page_size": page_size,
-            "total_pages": total_pages
+            "total_pages": total_pages,
+            "next_cursor": next_cursor
         }
+
+        self._transactions_cache[cache_key] = (time.monotonic() + self.CACHE_TTL_SECONDS, result)
+        if len(self._transactions_cache) > self.TRANSACTIONS_CACHE_SIZE:
+            self._transactions_cache.popitem(last=False)
+
+        return result
     
     async def get_summary_stats(
         self,
@@ -261,103 +452,258 @@ class SalesService:
         date_to: Optional[str] = None,
     ) -> SummaryStats:
         """Get summary statistics based on current filters"""
-        
-        query = self._build_query(
-            customer_regions=customer_regions,
-            genders=genders,
-            age_min=age_min,
-            age_max=age_max,
-            product_categories=product_categories,
-            tags=tags,
-            payment_methods=payment_methods,
-            date_from=date_from,
-            date_to=date_to
+
+        cache_key = (
+            tuple(customer_regions) if customer_regions else None,
+            tuple(genders) if genders else None,
+            age_min,
+            age_max,
+            tuple(product_categories) if product_categories else None,
+            tuple(tags) if tags else None,
+            tuple(payment_methods) if payment_methods else None,
+            date_from,
+            date_to
         )
-        
+        cached = self._summary_cache.get(cache_key)
+        if cached is not None and cached[0] > time.monotonic():
+            self._summary_cache.move_to_end(cache_key)
+            return cached[1]
+
+        if age_min is None and age_max is None and not tags:
+            # The rollup keys on (date, region, gender, category, payment),
+            # so filters over only those dimensions can be answered from the
+            # pre-summed buckets instead of every matching transaction
+            summary = await self._summary_from_rollup(
+                customer_regions=customer_regions,
+                genders=genders,
+                product_categories=product_categories,
+                payment_methods=payment_methods,
+                date_from=date_from,
+                date_to=date_to
+            )
+        else:
+            query = self._build_query(
+                customer_regions=customer_regions,
+                genders=genders,
+                age_min=age_min,
+                age_max=age_max,
+                product_categories=product_categories,
+                tags=tags,
+                payment_methods=payment_methods,
+                date_from=date_from,
+                date_to=date_to
+            )
+
+            pipeline = [
+                {'$match': query},
+                {'$group': self.SUMMARY_GROUP}
+            ]
+
+            result = await self.read_collection.aggregate(pipeline).to_list(length=1)
+            summary = self._summary_from_group(result[0] if result else None)
+
+        self._summary_cache[cache_key] = (time.monotonic() + self.CACHE_TTL_SECONDS, summary)
+        if len(self._summary_cache) > self.SUMMARY_CACHE_SIZE:
+            self._summary_cache.popitem(last=False)
+
+        return summary
+    
+    async def _summary_from_rollup(
+        self,
+        customer_regions: Optional[List[str]] = None,
+        genders: Optional[List[str]] = None,
+        product_categories: Optional[List[str]] = None,
+        payment_methods: Optional[List[str]] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+    ) -> SummaryStats:
+        """Aggregate the pre-summed rollup buckets built by the migration"""
+        self._validate_filters(date_from=date_from, date_to=date_to)
+
+        match = {}
+        customer_regions = self._normalize_string_list(customer_regions, to_lowercase=True)
+        if customer_regions:
+            match['_id.customer_region'] = {'$in': customer_regions}
+        genders = self._normalize_string_list(genders, to_lowercase=True)
+        if genders:
+            match['_id.gender'] = {'$in': genders}
+        product_categories = self._normalize_string_list(product_categories, to_lowercase=True)
+        if product_categories:
+            match['_id.product_category'] = {'$in': product_categories}
+        payment_methods = self._normalize_string_list(payment_methods, to_lowercase=True)
+        if payment_methods:
+            match['_id.payment_method'] = {'$in': payment_methods}
+        if date_from and date_from.strip() or date_to and date_to.strip():
+            date_query = {}
+            try:
+                if date_from and date_from.strip():
+                    date_query['$gte'] = _parse_iso_date(date_from.strip())
+                if date_to and date_to.strip():
+                    date_query['$lte'] = _parse_iso_date(date_to.strip())
+            except ValueError:
+                raise ValueError(f"Invalid date format. Expected YYYY-MM-DD format.")
+            match['_id.date'] = date_query
+
         pipeline = [
-            {'$match': query},
+            {'$match': match},
             {
                 '$group': {
                     '_id': None,
-                    'total_units_sold': {'$sum': '$quantity'},
+                    'total_units_sold': {'$sum': '$total_units_sold'},
                     'total_amount': {'$sum': '$total_amount'},
-                    'total_final_amount': {'$sum': '$final_amount'},
-                    'total_sales_records': {'$sum': 1}
+                    'total_final_amount': {'$sum': '$total_final_amount'},
+                    'total_sales_records': {'$sum': '$total_sales_records'}
                 }
             }
         ]
-        
-        result = list(self.collection.aggregate(pipeline))
-        
-        if not result:
+        result = await self.rollup_collection.aggregate(pipeline).to_list(length=1)
+        return self._summary_from_group(result[0] if result else None)
+
+    def _summary_from_group(self, stats: Optional[dict]) -> SummaryStats:
+        """Convert a SUMMARY_GROUP result document to a SummaryStats model"""
+        if not stats:
             return SummaryStats(
                 total_units_sold=0,
                 total_amount=0.0,
                 total_discount=0.0,
                 total_sales_records=0
             )
-        
-        stats = result[0]
         total_discount = stats['total_amount'] - stats['total_final_amount']
-        
         return SummaryStats(
             total_units_sold=int(stats['total_units_sold']),
             total_amount=float(stats['total_amount']),
             total_discount=float(total_discount),
             total_sales_records=int(stats['total_sales_records'])
         )
-    
+
+    async def get_transactions_with_summary(
+        self,
+        search: Optional[str] = None,
+        customer_regions: Optional[List[str]] = None,
+        genders: Optional[List[str]] = None,
+        age_min: Optional[int] = None,
+        age_max: Optional[int] = None,
+        product_categories: Optional[List[str]] = None,
+        tags: Optional[List[str]] = None,
+        payment_methods: Optional[List[str]] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        sort_by: str = "date",
+        sort_order: str = "desc",
+        page: int = 1,
+        page_size: int = 10
+    ) -> dict:
+        """Fetch a transactions page and its summary stats in one round trip
+
+        The dashboard requests both views with the same filters, which used
+        to mean building the query twice and two server round trips. One
+        $facet aggregation executes the match once for the page, the count
+        and the totals.
+        """
+        query = self._build_query(
+            search=search,
+            customer_regions=customer_regions,
+            genders=genders,
+            age_min=age_min,
+            age_max=age_max,
+            product_categories=product_categories,
+            tags=tags,
+            payment_methods=payment_methods,
+            date_from=date_from,
+            date_to=date_to
+        )
+        sort_spec = self._build_sort(sort_by=sort_by, sort_order=sort_order)
+        skip = (page - 1) * page_size
+
+        pipeline = [
+            {'$match': query},
+            {
+                '$facet': {
+                    'data': [
+                        {'$sort': dict(sort_spec)},
+                        {'$skip': skip},
+                        {'$limit': page_size},
+                        {'$project': self.TRANSACTION_PROJECTION}
+                    ],
+                    'meta': [{'$count': 'total'}],
+                    'summary': [{'$group': self.SUMMARY_GROUP}]
+                }
+            }
+        ]
+        facets = (await self.read_collection.aggregate(pipeline).to_list(length=1))[0]
+        total = facets['meta'][0]['total'] if facets['meta'] else 0
+        total_pages = (total + page_size - 1) // page_size
+
+        transactions = []
+        for doc in facets['data']:
+            try:
+                transactions.append(self._convert_to_transaction(doc))
+            except Exception as e:
+                logger.warning(f"Error converting document: {str(e)}")
+                continue
+
+        return {
+            "transactions": transactions,
+            "total": total,
+            "page": page,
+            "page_size": page_size,
+            "total_pages": total_pages,
+            "summary": self._summary_from_group(
+                facets['summary'][0] if facets['summary'] else None
+            )
+        }
+
     async def get_filter_options(self) -> dict:
         """Get all unique filter options for dropdowns"""
-        
-        def to_title_case(s):
-            if not s:
-                return s
-            s_str = str(s).strip()
-            if not s_str:
-                return s_str
-            return s_str[0].upper() + s_str[1:].lower() if len(s_str) > 1 else s_str.upper()
-        
-        customer_regions = sorted([
-            to_title_case(val)
-            for val in self.collection.distinct('customer_region')
-            if val
-        ])
-        
-        genders = sorted([
-            to_title_case(val)
-            for val in self.collection.distinct('gender')
-            if val
-        ])
-        
-        product_categories = sorted([
-            to_title_case(val)
-            for val in self.collection.distinct('product_category')
-            if val
-        ])
-        
-        payment_methods = sorted([
-            to_title_case(val)
-            for val in self.collection.distinct('payment_method')
-            if val
-        ])
-        
-        tags_set = set()
+
+        cached = self._filter_options_cache
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+
+        # The lock keeps concurrent cache misses from all rerunning the same
+        # collection-wide aggregation when the TTL expires
+        async with self._filter_options_lock:
+            cached = self._filter_options_cache
+            if cached is not None and cached[0] > time.monotonic():
+                return cached[1]
+            return await self._compute_filter_options()
+
+    async def _compute_filter_options(self) -> dict:
+        # A single $facet round trip replaces four distinct() calls plus a
+        # per-document tag loop; the tag split and dedup run server-side so
+        # only the small distinct sets cross the wire
         pipeline = [
-            {'$project': {'tags': 1}},
-            {'$match': {'tags': {'$ne': '', '$exists': True}}}
+            {
+                '$facet': {
+                    'customer_regions': [{'$group': {'_id': '$customer_region'}}],
+                    'genders': [{'$group': {'_id': '$gender'}}],
+                    'product_categories': [{'$group': {'_id': '$product_category'}}],
+                    'payment_methods': [{'$group': {'_id': '$payment_method'}}],
+                    'tags': [
+                        {'$match': {'tags': {'$nin': [None, '']}}},
+                        {'$project': {'t': {'$split': ['$tags', ',']}}},
+                        {'$unwind': '$t'},
+                        {'$group': {'_id': {'$trim': {'input': '$t'}}}}
+                    ]
+                }
+            }
         ]
-        for doc in self.collection.aggregate(pipeline):
-            if doc.get('tags'):
-                tag_list = [t.strip() for t in str(doc['tags']).split(',') if t.strip()]
-                tags_set.update(tag_list)
-        
-        tags = sorted([to_title_case(t) for t in tags_set])
-        
-        return {
-            "customer_regions": customer_regions,
-            "genders": genders,
-            "product_categories": product_categories,
-            "payment_methods": payment_methods,
-            "tags": tags
+        result = await self.read_collection.aggregate(pipeline).to_list(length=1)
+        facets = result[0] if result else {}
+
+        def _options(facet_name: str) -> List[str]:
+            return sorted(
+                _to_title_case(doc['_id'])
+                for doc in facets.get(facet_name, [])
+                if doc['_id']
+            )
+
+        options = {
+            "customer_regions": _options('customer_regions'),
+            "genders": _options('genders'),
+            "product_categories": _options('product_categories'),
+            "payment_methods": _options('payment_methods'),
+            "tags": _options('tags')
         }
+        self._filter_options_cache = (time.monotonic() + self.CACHE_TTL_SECONDS, options)
+        return options